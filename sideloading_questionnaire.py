@@ -5,9 +5,46 @@ A script for conducting the 600-question personality modeling questionnaire.
 Follows the principles from AGENTS.md for clean, readable, and maintainable code.
 """
 
+import atexit
+import mmap
 import os
+import re
 import sys
-from typing import List, Dict, Tuple, Optional
+import time
+import unicodedata
+from pathlib import Path
+from typing import Iterator, List, Dict, Tuple, Optional
+
+# Matches the question ID of an "ID;Question;Answer" line in the answers file
+_ID_RE = re.compile(rb'^\s*(\d+);[^\n]*;', re.MULTILINE)
+
+# Separator lines used by the console output
+_EQ60 = "=" * 60
+_DASH60 = "-" * 60
+_DASH30 = "-" * 30
+
+# Fixed console blocks, each written with a single call
+_WELCOME = f"""{_EQ60}
+🎯 WELCOME TO THE SIDELOADING QUESTIONNAIRE SYSTEM 🎯
+{_EQ60}
+
+This system will guide you through a comprehensive
+600-question personality modeling questionnaire.
+
+You can stop at any time and resume later where you left off.
+Your progress will be automatically saved.
+{_EQ60}
+"""
+
+_INSTRUCTIONS = f"""
+{_EQ60}
+📝 QUESTIONNAIRE INSTRUCTIONS:
+• Answer each question as detailed as possible
+• Type 'QUIT' at any time to save and exit
+• Type 'SKIP' to skip a question
+• Your progress is automatically saved
+{_EQ60}
+"""
 
 
 class QuestionnaireManager:
@@ -27,34 +64,74 @@ class QuestionnaireManager:
         'portuguese': 'portugues',
         'russian': 'ruso'
     }
+    _AVAILABLE_ITEMS = tuple(AVAILABLE_LANGUAGES.items())
+    
+    # Bytes read from the end of the answers file when looking for progress
+    TAIL_READ_SIZE = 4096
+    
+    # Answers are group-committed: when an answer is saved, pending answers are
+    # written and fsynced if FLUSH_EVERY are queued or FLUSH_INTERVAL seconds have
+    # passed since the last flush. The interval is only checked on save, so at
+    # human typing speed each answer is usually synced on its own; batching only
+    # kicks in for fast input (e.g. pasted or piped answers). A hard kill
+    # (e.g. kill -9) may lose up to FLUSH_EVERY - 1 answers; QUIT, Ctrl-C and
+    # normal exits always flush.
+    FLUSH_EVERY = 8
+    FLUSH_INTERVAL = 2.0
     
     def __init__(self):
         self.current_language = None
-        self.questions = []
+        self.questions: Tuple[str, ...] = ()
+        self._num_questions = 0
+        self._q_bytes: List[bytes] = []
         self.answers_file_path = None
+        self.progress_file_path = None
         self.questions_file_path = None
+        self._answers_fh = None
+        self._pending: List[bytes] = []
+        self._last_flush = time.monotonic()
+        self._last_saved_id: Optional[int] = None
+        self._progress_id: Optional[int] = None
+        self._available_langs: Optional[Tuple[Tuple[str, str], ...]] = None
+        self._question_files: Dict[str, str] = {}
+        self._menu_str: Optional[str] = None
     
     def display_welcome_message(self) -> None:
         """Display welcome message in English."""
-        print("=" * 60)
-        print("🎯 WELCOME TO THE SIDELOADING QUESTIONNAIRE SYSTEM 🎯")
-        print("=" * 60)
-        print("\nThis system will guide you through a comprehensive")
-        print("600-question personality modeling questionnaire.")
-        print("\nYou can stop at any time and resume later where you left off.")
-        print("Your progress will be automatically saved.")
-        print("=" * 60)
+        sys.stdout.write(_WELCOME)
+    
+    def _get_available(self) -> Tuple[Tuple[str, str], ...]:
+        """Return the (english_name, file_suffix) pairs whose file exists, checked only once."""
+        if self._available_langs is None:
+            # One directory read instead of a stat per language. Names are compared
+            # NFC-normalized since some filesystems store "español" decomposed, and
+            # the on-disk name is kept so load_questions opens the file that exists.
+            present = {
+                unicodedata.normalize('NFC', path.name): path.name
+                for path in Path('.').glob('600Q_*.txt')
+            }
+            available = []
+            for english_name, file_suffix in self._AVAILABLE_ITEMS:
+                file_name = present.get(unicodedata.normalize('NFC', f"600Q_{file_suffix}.txt"))
+                if file_name is not None:
+                    available.append((english_name, file_suffix))
+                    self._question_files[file_suffix] = file_name
+            self._available_langs = tuple(available)
+        return self._available_langs
+    
+    def _get_menu(self) -> str:
+        """Return the language menu, formatted only once."""
+        if self._menu_str is None:
+            entries = "\n".join(
+                f"{idx:2d}. {english_name.title()}"
+                for idx, (english_name, _) in enumerate(self._get_available(), 1)
+            )
+            self._menu_str = f"\n📋 AVAILABLE LANGUAGES:\n{_DASH30}\n{entries}\n{_DASH30}"
+        return self._menu_str
     
     def display_available_languages(self) -> None:
         """Display available languages for the questionnaire."""
-        print("\n📋 AVAILABLE LANGUAGES:")
-        print("-" * 30)
-        for idx, (english_name, file_suffix) in enumerate(self.AVAILABLE_LANGUAGES.items(), 1):
-            # Check if the file actually exists
-            file_path = f"600Q_{file_suffix}.txt"
-            if os.path.exists(file_path):
-                print(f"{idx:2d}. {english_name.title()}")
-        print("-" * 30)
+        print(self._get_menu())
     
     def get_language_choice(self) -> str:
         """Get user's language choice and return the file suffix."""
@@ -64,18 +141,12 @@ class QuestionnaireManager:
                 choice = input("\nPlease enter the number of your preferred language: ").strip()
                 choice_num = int(choice)
                 
-                available_langs = list(self.AVAILABLE_LANGUAGES.items())
+                available_langs = self._get_available()
                 if 1 <= choice_num <= len(available_langs):
                     english_name, file_suffix = available_langs[choice_num - 1]
-                    
-                    # Verify file exists
-                    if os.path.exists(f"600Q_{file_suffix}.txt"):
-                        self.current_language = file_suffix
-                        print(f"\n✅ Great! You selected: {english_name.title()}")
-                        return file_suffix
-                    else:
-                        print(f"\n❌ Sorry, the {english_name} questionnaire file is not available.")
-                        continue
+                    self.current_language = file_suffix
+                    print(f"\n✅ Great! You selected: {english_name.title()}")
+                    return file_suffix
                 else:
                     print("\n❌ Invalid choice. Please select a valid number.")
             except ValueError:
@@ -83,58 +154,191 @@ class QuestionnaireManager:
     
     def load_questions(self, language_suffix: str) -> bool:
         """Load questions from the specified language file."""
-        self.questions_file_path = f"600Q_{language_suffix}.txt"
-        
-        if not os.path.exists(self.questions_file_path):
-            print(f"❌ Questions file not found: {self.questions_file_path}")
-            return False
+        self.questions_file_path = self._question_files.get(
+            language_suffix, f"600Q_{language_suffix}.txt"
+        )
         
         try:
-            with open(self.questions_file_path, 'r', encoding='utf-8') as file:
-                self.questions = [line.strip() for line in file if line.strip()]
+            with open(self.questions_file_path, 'rb') as file:
+                self.questions = tuple(
+                    self._strip_prefix(line) for line in self._read_lines(file) if line
+                )
+            self._num_questions = len(self.questions)
+            self._q_bytes = [question.encode('utf-8') for question in self.questions]
             
-            print(f"✅ Loaded {len(self.questions)} questions successfully!")
+            print(f"✅ Loaded {self._num_questions} questions successfully!")
             return True
+        except FileNotFoundError:
+            print(f"❌ Questions file not found: {self.questions_file_path}")
+            return False
         except Exception as e:
             print(f"❌ Error loading questions: {e}")
             return False
     
+    @staticmethod
+    def _read_lines(file) -> Iterator[str]:
+        """Yield the stripped lines of a binary file, read through a memory map."""
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            size = len(mm)
+            while pos < size:
+                end = mm.find(b'\n', pos)
+                if end == -1:
+                    end = size
+                yield mm[pos:end].decode('utf-8').strip()
+                pos = end + 1
+    
+    @staticmethod
+    def _strip_prefix(question_text: str) -> str:
+        """Remove the number prefix if it exists (e.g., "1. " -> "")."""
+        head, sep, tail = question_text.partition('. ')
+        return tail if sep and head.isdigit() else question_text
+    
     def get_last_answered_question(self) -> int:
         """Check answers file and return the ID of the last answered question."""
         if not os.path.exists(self.answers_file_path):
             return 0
         
-        try:
-            with open(self.answers_file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-            
-            # Find the last valid answer entry
-            last_id = 0
-            for line in lines:
-                line = line.strip()
-                if line and ';' in line:
-                    try:
-                        parts = line.split(';', 2)  # Split into max 3 parts
-                        if len(parts) >= 3:
-                            question_id = int(parts[0])
-                            last_id = max(last_id, question_id)
-                    except ValueError:
-                        continue
-            
+        last_id = self._read_progress()
+        if last_id is not None:
             return last_id
+        
+        try:
+            with open(self.answers_file_path, 'rb') as file:
+                file.seek(0, os.SEEK_END)
+                size = file.tell()
+                if size <= self.TAIL_READ_SIZE:
+                    file.seek(0)
+                    return self._scan_answer_ids(file.read())
+                
+                # Answers are appended in order, so the last entry is at the end
+                file.seek(size - self.TAIL_READ_SIZE)
+                tail = file.read()
+                # The first line of the window may be cut, so never trust it
+                for line in reversed(tail.splitlines()[1:]):
+                    question_id = self._parse_answer_id(line)
+                    if question_id is not None:
+                        return question_id
+                
+                # No valid entry near the end, fall back to a full scan
+                file.seek(0)
+                return self._scan_answer_ids(file.read())
         except Exception as e:
             print(f"⚠️  Warning: Could not read answers file: {e}")
             return 0
     
+    def _read_progress(self) -> Optional[int]:
+        """Return the last answered ID from the progress file, or None if unusable.
+        
+        The progress file holds "<last_id> <answers_file_size>"; it is only
+        trusted while the answers file still has the recorded size.
+        """
+        if not self.progress_file_path:
+            return None
+        try:
+            with open(self.progress_file_path, 'rb') as file:
+                last_id, size = (int(field) for field in file.read().split())
+            if os.path.getsize(self.answers_file_path) != size:
+                return None
+            return last_id
+        except (OSError, ValueError):
+            return None
+    
+    def _write_progress(self) -> None:
+        """Atomically record the last saved ID and the answers file size.
+        
+        Only called when the session ends (QUIT, Ctrl-C or exit) and not
+        fsynced: a stale or missing progress file just falls back to a scan.
+        If answers are still pending because a flush failed, any existing
+        progress file is removed instead, so the next resume scans the
+        answers file rather than skipping answers that were never written.
+        """
+        if not self.progress_file_path or self._last_saved_id is None:
+            return
+        if self._pending:
+            try:
+                os.remove(self.progress_file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️  Warning: Could not remove progress file: {e}")
+            self._progress_id = None
+            return
+        if self._last_saved_id == self._progress_id:
+            return
+        tmp_path = self.progress_file_path + '.tmp'
+        try:
+            size = os.fstat(self._answers_fh.fileno()).st_size
+            with open(tmp_path, 'wb') as file:
+                file.write(b'%d %d' % (self._last_saved_id, size))
+            os.replace(tmp_path, self.progress_file_path)
+            self._progress_id = self._last_saved_id
+        except OSError as e:
+            print(f"⚠️  Warning: Could not update progress file: {e}")
+    
+    @staticmethod
+    def _scan_answer_ids(data: bytes) -> int:
+        """Return the highest question ID found in the given answers data."""
+        return max((int(m.group(1)) for m in _ID_RE.finditer(data)), default=0)
+    
+    @staticmethod
+    def _parse_answer_id(line: bytes) -> Optional[int]:
+        """Return the question ID of an answers line, or None if it is not valid."""
+        match = _ID_RE.match(line)
+        return int(match.group(1)) if match else None
+    
     def save_answer(self, question_id: int, question: str, answer: str) -> None:
         """Save a single answer to the answers file."""
         try:
-            with open(self.answers_file_path, 'a', encoding='utf-8') as file:
-                # Format: ID;Question;Answer
-                file.write(f"{question_id};{question};{answer}\n")
+            # Format: ID;Question;Answer. The pre-encoded text from load_questions is
+            # reused when the caller passes the loaded question; otherwise it is encoded here.
+            # In the answer, backslash, ';', newline and carriage return are written as
+            # \\, \;, \n and \r so every record stays on one line starting with "<ID>;".
+            answer_safe = (
+                answer.replace('\\', '\\\\')
+                .replace(';', '\\;')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r')
+            )
+            if question_id < self._num_questions and question == self.questions[question_id]:
+                question_bytes = self._q_bytes[question_id]
+            else:
+                question_bytes = question.encode('utf-8')
+            line = b'%d;%b;%b\n' % (question_id, question_bytes, answer_safe.encode('utf-8'))
+            self._pending.append(line)
+            self._last_saved_id = question_id
+            self._maybe_flush(force=False)
         except Exception as e:
             print(f"❌ Error saving answer: {e}")
     
+    def _maybe_flush(self, force: bool) -> None:
+        """Write and fsync pending answers if the batch is full, stale or forced."""
+        if not self._pending or self._answers_fh is None or self._answers_fh.closed:
+            return
+        if not force and len(self._pending) < self.FLUSH_EVERY \
+                and time.monotonic() - self._last_flush < self.FLUSH_INTERVAL:
+            return
+        try:
+            data = memoryview(b''.join(self._pending))
+            while data:
+                data = data[self._answers_fh.write(data):]
+            os.fsync(self._answers_fh.fileno())
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            print(f"❌ Error syncing answers file: {e}")
+    
+    def close_answers(self) -> None:
+        """Flush any pending answers and close the answers file."""
+        if self._answers_fh is None or self._answers_fh.closed:
+            return
+        self._maybe_flush(force=True)
+        self._write_progress()
+        self._answers_fh.close()
+    
     def start_questionnaire_session(self) -> None:
         """Start or resume the questionnaire session."""
         if not self.questions:
@@ -142,38 +346,38 @@ class QuestionnaireManager:
             return
         
         self.answers_file_path = f"600A_{self.current_language}.txt"
+        self.progress_file_path = f"600A_{self.current_language}.progress"
         
         # Check for existing progress
         last_answered = self.get_last_answered_question()
         start_question = last_answered
         
+        # Keep the answers file open for the whole session; closed on exit.
+        # Unbuffered, since _pending already batches the writes
+        self._answers_fh = open(self.answers_file_path, 'ab', buffering=0)
+        atexit.register(self.close_answers)
+        
         if last_answered > 0:
             print(f"\n🔄 RESUMING SESSION")
             print(f"You have already answered {last_answered} questions.")
             print(f"Starting from question {last_answered + 1}...")
         else:
             print(f"\n🆕 STARTING NEW SESSION")
-            print(f"Beginning with question 1 of {len(self.questions)}...")
+            print(f"Beginning with question 1 of {self._num_questions}...")
         
         print(f"💾 Answers will be saved to: {self.answers_file_path}")
-        print("\n" + "=" * 60)
-        print("📝 QUESTIONNAIRE INSTRUCTIONS:")
-        print("• Answer each question as detailed as possible")
-        print("• Type 'QUIT' at any time to save and exit")
-        print("• Type 'SKIP' to skip a question")
-        print("• Your progress is automatically saved")
-        print("=" * 60)
+        sys.stdout.write(_INSTRUCTIONS)
         
         input("\nPress ENTER to continue...")
         
         # Start asking questions
-        for i in range(start_question, len(self.questions)):
+        for i in range(start_question, self._num_questions):
             if not self.ask_question(i):
                 break
         
-        if start_question < len(self.questions):
+        if start_question < self._num_questions:
             print(f"\n🎉 QUESTIONNAIRE COMPLETED!")
-            print(f"All {len(self.questions)} questions have been answered.")
+            print(f"All {self._num_questions} questions have been answered.")
             print(f"Your complete responses are saved in: {self.answers_file_path}")
         
     def ask_question(self, question_index: int) -> bool:
@@ -181,39 +385,40 @@ class QuestionnaireManager:
         question_id = question_index
         question_text = self.questions[question_index]
         
-        # Remove the number prefix if it exists (e.g., "1. " -> "")
-        if '. ' in question_text and question_text.split('. ', 1)[0].isdigit():
-            question_text = question_text.split('. ', 1)[1]
-        
-        print(f"\n" + "-" * 60)
-        print(f"Question {question_id + 1} of {len(self.questions)}")
-        print("-" * 60)
-        print(f"📋 {question_text}")
-        print("-" * 60)
+        # Write the whole question block at once rather than line by line
+        sys.stdout.write(
+            f"\n{_DASH60}\nQuestion {question_id + 1} of {self._num_questions}\n"
+            f"{_DASH60}\n📋 {question_text}\n{_DASH60}\n"
+        )
+        sys.stdout.flush()
         
         while True:
             try:
                 answer = input("Your answer: ").strip()
-                
-                if answer.upper() == 'QUIT':
-                    print(f"\n💾 Session saved! You can resume from question {question_id + 1} next time.")
-                    return False
-                elif answer.upper() == 'SKIP':
-                    answer = "[SKIPPED]"
-                elif not answer:
-                    print("Please provide an answer, type 'SKIP' to skip, or 'QUIT' to exit.")
-                    continue
-                
-                # Save the answer
-                self.save_answer(question_id, self.questions[question_index], answer)
-                print("💾 Answer saved!")
-                return True
-                
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
+                self._maybe_flush(force=True)
+                self._write_progress()
                 print(f"\n\n💾 Session interrupted! Progress saved. Resume from question {question_id + 1} next time.")
                 return False
-            except Exception as e:
-                print(f"❌ Error: {e}. Please try again.")
+            
+            if not answer:
+                print("Please provide an answer, type 'SKIP' to skip, or 'QUIT' to exit.")
+                continue
+            
+            command = answer.upper()
+            if command == 'QUIT':
+                self._maybe_flush(force=True)
+                self._write_progress()
+                print(f"\n💾 Session saved! You can resume from question {question_id + 1} next time.")
+                return False
+            elif command == 'SKIP':
+                answer = "[SKIPPED]"
+            
+            # Save the answer with the text that was displayed; as it is the loaded
+            # question, save_answer reuses its pre-encoded bytes
+            self.save_answer(question_id, question_text, answer)
+            print("💾 Answer saved!")
+            return True
 
 
 def main():